@@ -1,16 +1,45 @@
+import importlib
 import click
-from toolbelt.commands.dev import dev
-from toolbelt.commands.init import init
 
 
-@click.group(context_settings=dict(help_option_names=["-h", "--help"]))
+class LazyGroup(click.Group):
+    """Group that imports each subcommand's module only when that subcommand is used."""
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # {"name": "package.module:attribute"}
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _lazy_load(self, cmd_name):
+        modname, attr = self.lazy_subcommands[cmd_name].split(":", 1)
+        cmd = getattr(importlib.import_module(modname), attr)
+        if not isinstance(cmd, click.Command):
+            raise TypeError(
+                f"Lazy loading of {self.lazy_subcommands[cmd_name]} did not return a click Command"
+            )
+        return cmd
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "dev": "toolbelt.commands.dev:dev",
+        "init": "toolbelt.commands.init:init",
+    },
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
 def main():
     """Your team's unified CLI toolbelt."""
     pass
 
 
-main.add_command(dev)
-main.add_command(init)
-
 if __name__ == "__main__":
     main()
@@ -1,7 +1,136 @@
+import io
+import json
+import os
 import sys
+import tempfile
 import click
-import importlib.util
-from toolbelt.utils import log, sh
+import importlib
+from contextlib import redirect_stderr, redirect_stdout
+from typing import List, Optional, Sequence, Tuple
+from toolbelt.utils import deps, fingerprint, log, pytestd, sh
+
+
+def _call_main(modname: str, argv: Sequence[str], fallback: Sequence[str]) -> Tuple[str, str]:
+    """Run `modname.main()` in this interpreter, or `fallback` as a subprocess if it can't be imported."""
+    try:
+        main = importlib.import_module(modname).main
+    except (ImportError, AttributeError):
+        return sh.run(fallback)
+
+    # Some tools (flake8) write through sys.stdout.buffer, so capture into real text wrappers
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", errors="replace")
+    err = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", errors="replace")
+    saved_argv = sys.argv
+    sys.argv = [modname, *argv]
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            rc = main()
+    except SystemExit as e:
+        rc = e.code
+    except Exception as e:
+        # A crashing tool should fail like a subprocess would, not dump a traceback
+        err.write(f"{modname} crashed: {e!r}\n")
+        rc = 1
+    finally:
+        sys.argv = saved_argv
+
+    # Normalize like the interpreter would: None is success, a message means failure
+    if rc is None:
+        rc = 0
+    elif not isinstance(rc, int):
+        err.write(f"{rc}\n")
+        rc = 1
+
+    captured = []
+    for stream in (out, err):
+        stream.flush()
+        captured.append(stream.buffer.getvalue().decode("utf-8", errors="replace"))
+    if rc != 0:
+        raise sh.ShellError(fallback, rc, *captured)
+    return captured[0].strip(), captured[1].strip()
+
+
+def _ruff_cmd() -> List[str]:
+    # ruff is a native binary; calling it directly skips the `python -m ruff` shim interpreter
+    try:
+        from ruff.__main__ import find_ruff_bin
+
+        return [os.fsdecode(find_ruff_bin())]
+    except (ImportError, FileNotFoundError):
+        return [sys.executable, "-m", "ruff"]
+
+
+def _ruff_json(cmd: Sequence[str]) -> List[dict]:
+    """Run a `ruff check` command writing a JSON report; return its diagnostics."""
+    with tempfile.TemporaryDirectory(prefix="toolbelt-") as tmp:
+        report = os.path.join(tmp, "ruff.json")
+        cmd = [*cmd, "--output-format", "json", "--output-file", report]
+        try:
+            sh.run(cmd)
+        except sh.ShellError as e:
+            # Exit code 1 just means "violations found"; anything else is a real failure
+            if e.code != 1:
+                raise
+        with open(report, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _pytest_has_xdist(pytest_bin: str) -> bool:
+    """Whether pytest-xdist is importable in the environment that owns `pytest_bin`."""
+    # abspath, not realpath: a venv's python is a symlink to the base interpreter
+    bin_dir = os.path.dirname(os.path.abspath(pytest_bin))
+    if bin_dir == os.path.dirname(os.path.abspath(sys.executable)):
+        return deps.has("xdist")
+
+    # A different environment (e.g. the project's venv): ask its interpreter
+    python = os.path.join(bin_dir, "python.exe" if os.name == "nt" else "python")
+    if not os.path.exists(python):
+        return False
+    probe = "import importlib.util, sys; sys.exit(importlib.util.find_spec('xdist') is None)"
+    try:
+        sh.run([python, "-c", probe])
+    except (sh.ShellError, OSError):
+        return False
+    return True
+
+
+def _targets(paths: Sequence[str], legacy: Sequence[str]) -> List[str]:
+    # Positional PATHS plus any repeated --path options; default to the current directory
+    return [*paths, *legacy] or ["."]
+
+
+def _batches(targets: Sequence[str], size: int) -> List[List[str]]:
+    # One batch holding every target unless the user asked for smaller ones
+    if size <= 0:
+        return [list(targets)]
+    return [list(targets[i : i + size]) for i in range(0, len(targets), size)]
+
+
+PATHS_ARG = click.argument("paths", nargs=-1, type=click.Path())
+LEGACY_PATH_OPT = click.option(
+    "--path", "legacy_paths", multiple=True, help="Same as PATHS (may be repeated)."
+)
+BATCH_SIZE_OPT = click.option(
+    "--batch-size",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Max paths per tool invocation (0 = all at once). "
+    "One big invocation is usually fastest since ruff/black parallelize internally.",
+)
+
+EXEC_OPT = click.option(
+    "--exec",
+    "exec_",
+    is_flag=True,
+    help="Replace toolbelt with the tool's process (no output capture or summary; saves a process hop).",
+)
+
+NO_CACHE_OPT = click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always run, even if nothing changed since the last successful run.",
+)
 
 
 @click.group(help="Developer helpers")
@@ -9,28 +138,79 @@ def dev():
     pass
 
 
-@dev.command(help="Run linters (ruff recommended).")
-@click.option("--path", default=".", show_default=True)
+@dev.command(help="Run linters (ruff recommended) on PATHS (default: current directory).")
+@PATHS_ARG
+@LEGACY_PATH_OPT
 @click.option("--fix", is_flag=True, help="Automatically fix issues.")
-def lint(path: str, fix: bool):
+@click.option(
+    "--ci",
+    is_flag=True,
+    help="CI mode: have ruff write one JSON report and print a plain summary.",
+)
+@BATCH_SIZE_OPT
+@EXEC_OPT
+@NO_CACHE_OPT
+def lint(
+    paths: Tuple[str, ...],
+    legacy_paths: Tuple[str, ...],
+    fix: bool,
+    ci: bool,
+    batch_size: int,
+    exec_: bool,
+    no_cache: bool,
+):
+    targets = _targets(paths, legacy_paths)
+    batches = _batches(targets, batch_size)
+    # Only a single invocation can be the last thing we do (and --ci needs to read the report)
+    exec_ = exec_ and len(batches) == 1 and not ci
+
+    linter = "ruff" if deps.has("ruff") else "flake8" if deps.has("flake8") else None
+    key_args = ([linter], ["--fix"] if fix else [], targets)
+    if linter and not no_cache and fingerprint.seen(fingerprint.run_key(*key_args)):
+        log.ok("Lint: no changes since last successful run")
+        return
+
     try:
         # Check if ruff is installed in the same environment
-        if importlib.util.find_spec("ruff") is not None:
+        if linter == "ruff":
             log.info("Running ruff …")
-            cmd = [sys.executable, "-m", "ruff", "check", path]
-            if fix:
-                cmd.append("--fix")
-            sh.run(cmd)
+            diagnostics = []
+            for batch in batches:
+                cmd = [*_ruff_cmd(), "check", *batch]
+                if fix:
+                    cmd.append("--fix")
+                if ci:
+                    # A JSON file is much cheaper for ruff to emit than formatted terminal output
+                    diagnostics.extend(_ruff_json(cmd))
+                    continue
+                if exec_:
+                    sh.replace_process(cmd)
+                sh.run(cmd)
+
+            if diagnostics:
+                diagnostics.sort(key=lambda d: (d["filename"], d["location"]["row"], d["location"]["column"]))
+                for d in diagnostics:
+                    loc = d["location"]
+                    where = f"{os.path.relpath(d['filename'])}:{loc['row']}:{loc['column']}"
+                    print(f"{where}: {d.get('code') or 'E'} {d['message']}")
+                log.err(f"ruff found {len(diagnostics)} issue(s)")
+                raise SystemExit(1)
 
         # Fallback: flake8 (if installed)
-        elif importlib.util.find_spec("flake8") is not None:
+        elif linter == "flake8":
             log.info("ruff not found; falling back to flake8 …")
-            sh.run([sys.executable, "-m", "flake8", path])
+            for batch in batches:
+                if exec_:
+                    sh.replace_process([sys.executable, "-m", "flake8", *batch])
+                _call_main("flake8.main.cli", batch, [sys.executable, "-m", "flake8", *batch])
 
         else:
             log.warn("No linter found (ruff/flake8). Make sure toolbelt is installed with its dependencies.")
             return
 
+        # Fingerprint after the run so files rewritten by --fix count as clean
+        if not no_cache:
+            fingerprint.remember(fingerprint.run_key(*key_args), linter)
         log.ok("Lint completed")
 
     except sh.ShellError as e:
@@ -43,8 +223,9 @@ def lint(path: str, fix: bool):
         raise SystemExit(1)
 
 
-@dev.command(help="Auto-format code (black + isort if available).")
-@click.option("--path", default=".", show_default=True)
+@dev.command(help="Auto-format PATHS (default: current directory) with black + isort if available.")
+@PATHS_ARG
+@LEGACY_PATH_OPT
 @click.option(
     "--check",
     is_flag=True,
@@ -55,36 +236,65 @@ def lint(path: str, fix: bool):
     is_flag=True,
     help="Show all files being processed.",
 )
-def format(path: str, check: bool, verbose: bool):
+@BATCH_SIZE_OPT
+@NO_CACHE_OPT
+def format(
+    paths: Tuple[str, ...],
+    legacy_paths: Tuple[str, ...],
+    check: bool,
+    verbose: bool,
+    batch_size: int,
+    no_cache: bool,
+):
     """Format code using the built-in Black (and isort if installed)."""
+    targets = _targets(paths, legacy_paths)
+    batches = _batches(targets, batch_size)
     try:
-        ran_any = False
+        # (tool, module exposing main(), flags)
+        tools = []
 
-        # --- Run Black (always available since it's a dependency) ---
-        log.info("Running black …")
-        cmd = [sys.executable, "-m", "black", path]
+        # --- Black (always available since it's a dependency) ---
+        args = []
         if check:
-            cmd.extend(["--check", "--diff"])
+            args.extend(["--check", "--diff"])
         if verbose:
-            cmd.append("--verbose")
-        sh.run(cmd)
-        ran_any = True
-
-        # --- Run isort if available (optional dependency) ---
-        if importlib.util.find_spec("isort") is not None:
-            log.info("Running isort …")
-            cmd = [sys.executable, "-m", "isort", path]
+            args.append("--verbose")
+        tools.append(("black", "black", args))
+
+        # --- isort if available (optional dependency) ---
+        if deps.has("isort"):
+            args = []
             if check:
-                cmd.extend(["--check-only", "--diff"])
+                args.extend(["--check-only", "--diff"])
             if verbose:
-                cmd.append("--verbose")
-            sh.run(cmd)
-            ran_any = True
+                args.append("--verbose")
+            tools.append(("isort", "isort.main", args))
 
-        if not ran_any:
+        if not tools:
             log.warn("No formatters found. Try installing optional dependency: isort")
             return
 
+        key_args = ([name for name, _, _ in tools], [arg for _, _, args in tools for arg in args], targets)
+        if not no_cache and fingerprint.seen(fingerprint.run_key(*key_args)):
+            log.ok("Format: no changes since last successful run")
+            return
+
+        if check:
+            # Read-only: both tools can inspect the tree at the same time
+            log.info(f"Running {' + '.join(name for name, _, _ in tools)} …")
+            for batch in batches:
+                sh.run_parallel([[sys.executable, "-m", name, *batch, *args] for name, _, args in tools])
+        else:
+            # Both tools rewrite files in place, so they must not race each other.
+            # Run them in-process to skip a fresh interpreter startup per tool.
+            for name, modname, args in tools:
+                log.info(f"Running {name} …")
+                for batch in batches:
+                    _call_main(modname, [*batch, *args], [sys.executable, "-m", name, *batch, *args])
+
+        # Fingerprint after the run so freshly formatted files count as clean
+        if not no_cache:
+            fingerprint.remember(fingerprint.run_key(*key_args), tools[0][0])
         log.ok("Formatting completed")
 
     except sh.ShellError as e:
@@ -102,12 +312,42 @@ def format(path: str, check: bool, verbose: bool):
 @click.option("--verbose", "-v", is_flag=True, help="Verbose pytest output (show all tests).")
 @click.option("--fail-fast", "-x", is_flag=True, help="Stop after first failure (pytest --maxfail=1).")
 @click.option("--nocapture", "-s", is_flag=True, help="Show print() output during tests (pytest -s).")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Parallel workers via pytest-xdist (default: CPU count - 2; 0 or 1 disables).",
+)
 @click.option(
     "--ci",
     is_flag=True,
     help="CI mode: fail fast, disable warnings, no color, short tracebacks.",
 )
-def test(path: str, verbose: bool, fail_fast: bool, nocapture: bool, ci: bool):
+@click.option(
+    "--cache",
+    is_flag=True,
+    help="Keep pytest's .pytest_cache (disabled by default to skip its reads/writes).",
+)
+@click.option(
+    "--daemon",
+    is_flag=True,
+    help="Reuse a background pytest process to skip interpreter startup and imports (Unix only). "
+    "The worker runs under toolbelt's own interpreter, not the pytest on PATH, so test "
+    "dependencies must be installed in toolbelt's environment.",
+)
+@EXEC_OPT
+def test(
+    path: str,
+    verbose: bool,
+    fail_fast: bool,
+    nocapture: bool,
+    jobs: Optional[int],
+    ci: bool,
+    cache: bool,
+    daemon: bool,
+    exec_: bool,
+):
     """
     Run tests using pytest if available, otherwise fall back to unittest.
     """
@@ -138,20 +378,55 @@ def test(path: str, verbose: bool, fail_fast: bool, nocapture: bool, ci: bool):
             if nocapture:
                 cmd.append("-s")
 
-            sh.run(cmd)
+            # Skip the lastfailed/nodeids bookkeeping unless explicitly wanted
+            if not cache:
+                cmd.extend(["-p", "no:cacheprovider"])
+
+            if daemon and pytestd.supported():
+                try:
+                    if not pytestd.is_alive():
+                        log.info("Starting pytest daemon …")
+                        pytestd.spawn()
+                    code, out = pytestd.client_send(cmd[1:])
+                except (OSError, RuntimeError, ValueError, KeyError) as e:
+                    # Worker didn't start, idled out mid-request, or sent a broken reply
+                    log.warn(f"pytest daemon unavailable ({e}); running pytest normally.")
+                else:
+                    if code != 0:
+                        raise sh.ShellError(cmd, code, out, "")
+                    print(out, end="")
+                    log.ok("Tests completed")
+                    return
+            elif daemon:
+                log.warn("--daemon needs Unix domain sockets; running pytest normally.")
+
+            # Shard across cores with pytest-xdist (doesn't play well with -s)
+            if jobs is None:
+                # Leave headroom so the editor/terminal stay responsive
+                jobs = max(1, (os.cpu_count() or 1) - 2)
+            # A single xdist worker is strictly slower than a plain run, so only shard for 2+
+            if not nocapture and jobs > 1 and _pytest_has_xdist(sh.which("pytest")):
+                cmd.extend(["-n", str(jobs)])
+
+            if exec_:
+                sh.replace_process(cmd)
+            sh.run(cmd, stream=True)
 
         else:
             log.info("pytest not found; running Python unittest discovery …")
             # Use the same interpreter for unittest
-            sh.run([sys.executable, "-m", "unittest", "discover", "-s", path])
+            cmd = [sys.executable, "-m", "unittest", "discover", "-s", path]
+            if exec_:
+                sh.replace_process(cmd)
+            sh.run(cmd, stream=True)
 
         log.ok("Tests completed")
 
     except sh.ShellError as e:
-        # Show captured output from the failed test run
-        if e.out:
+        # Show captured output from the failed test run (streamed runs already showed it live)
+        if e.out and not e.streamed:
             print(e.out, end="")
-        if e.err:
+        if e.err and not e.streamed:
             print(e.err, end="", file=sys.stderr)
         log.err(f"Command failed ({e.code}): {' '.join(e.cmd)}")
         raise SystemExit(1)
@@ -1,28 +1,52 @@
+import functools
+import operator
 import os
+import sys
 from pathlib import Path
 import venv
 import click
 from toolbelt.utils import log, sh
 from importlib import resources
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 
-# Directory: .../toolbelt/templates
-TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
 
-def template_path(*parts: str) -> Path:
-    """Return a concrete Path inside toolbelt/templates/..."""
-    return TEMPLATES_DIR.joinpath(*parts)
+def read_template(*parts: str) -> bytes:
+    """Read a file under toolbelt/templates/... via importlib.resources (works from zips/frozen apps)."""
+    try:
+        root = resources.files("toolbelt.templates")
+    except (TypeError, AttributeError):
+        # Python 3.9 can't resolve resources in namespace packages; use the on-disk layout
+        root = Path(__file__).resolve().parents[1] / "templates"
+    # One part at a time: namespace packages give a MultiplexedPath whose joinpath() takes a single child
+    return functools.reduce(operator.truediv, parts, root).read_bytes()
+
+
+# Read once at import so each bootstrap is just a write
+GITIGNORE = read_template("gitignore")
+PY_REQUIREMENTS = read_template("python", "requirements.txt")
+PY_PRECOMMIT_CONFIG = read_template("python", "pre-commit-config.yaml")
 
 
-def copy_file(src: Path, dst: Path) -> None:
+def write_template(content: bytes, dst: Path) -> None:
+    # Raw bytes: an exact copy of the template (no decode/encode or newline translation)
     dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
+    dst.write_bytes(content)
 
 
 def copy_precommit_config(project_root: Path) -> None:
-    dst = project_root / ".pre-commit-config.yaml"
-    src = template_path("python", "pre-commit-config.yaml")
-    copy_file(src, dst)
+    write_template(PY_PRECOMMIT_CONFIG, project_root / ".pre-commit-config.yaml")
+
+
+def venv_python(venv_dir: Path) -> Path:
+    return venv_dir / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
+
+
+def create_venv(venv_dir: Path) -> None:
+    # uv builds venvs much faster; --seed keeps pip available inside, like EnvBuilder(with_pip=True)
+    if sh.which("uv"):
+        sh.run(["uv", "venv", "--seed", "--python", sys.executable, str(venv_dir)])
+    else:
+        venv.EnvBuilder(with_pip=True).create(venv_dir)
 
 
 def copy_and_install_reqs(project_root: Path, venv_dir: Path, empty_reqs: bool) -> None:
@@ -32,20 +56,22 @@ def copy_and_install_reqs(project_root: Path, venv_dir: Path, empty_reqs: bool)
         dst.touch()
         log.info("Created empty requirements.txt")
     else:
-        src = template_path("python", "requirements.txt")
-        copy_file(src, dst)
+        write_template(PY_REQUIREMENTS, dst)
         log.ok("requirements.txt created with common dev tools")
 
-        pip_bin = venv_dir / ("Scripts/pip.exe" if os.name == "nt" else "bin/pip")
         log.info("Installing requirements …")
-        sh.run([str(pip_bin), "install", "-r", str(dst)])
+        if sh.which("uv"):
+            # Parallel downloads + native resolver: far faster than pip for the same requirements
+            cmd = ["uv", "pip", "install", "--python", str(venv_python(venv_dir)), "-r", str(dst)]
+        else:
+            pip_bin = venv_dir / ("Scripts/pip.exe" if os.name == "nt" else "bin/pip")
+            cmd = [str(pip_bin), "install", "-r", str(dst)]
+        sh.run(cmd, stream=True)
         log.ok("Requirements installed")
 
 
 def copy_gitignore(project_root: Path) -> None:
-    dst = project_root / ".gitignore"
-    src = template_path("gitignore")
-    copy_file(src, dst)
+    write_template(GITIGNORE, project_root / ".gitignore")
     log.ok("Wrote .gitignore")
 
 
@@ -71,22 +97,27 @@ def init_python(name: str, empty_reqs: bool):
     ensure_dir(project_root)
     log.header("Bootstrap: Python project", str(project_root))
 
-    try:
-        sh.ensure_bin("git")
-        if not (project_root / ".git").exists():
-            log.info("Initializing git repo …")
-            sh.run(["git", "init"], cwd=str(project_root))
-    except Exception as e:
-        log.warn(f"Git init skipped: {e}")
-
-    copy_gitignore(project_root)
-
+    # venv creation is the long pole; build it in the background while git init + .gitignore run
     venv_dir = project_root / "venv"
-    if not venv_dir.exists():
-        log.info("Creating virtual environment (venv) …")
-        builder = venv.EnvBuilder(with_pip=True)
-        builder.create(venv_dir)
-        log.ok("Virtual environment created")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        venv_job = None
+        if not venv_dir.exists():
+            log.info("Creating virtual environment (venv) …")
+            venv_job = pool.submit(create_venv, venv_dir)
+
+        try:
+            sh.ensure_bin("git")
+            if not (project_root / ".git").exists():
+                log.info("Initializing git repo …")
+                sh.run(["git", "init"], cwd=str(project_root))
+        except Exception as e:
+            log.warn(f"Git init skipped: {e}")
+
+        copy_gitignore(project_root)
+
+        if venv_job is not None:
+            venv_job.result()
+            log.ok("Virtual environment created")
 
     copy_and_install_reqs(project_root, venv_dir, empty_reqs)
 
@@ -114,32 +145,54 @@ def init_npm(name: str):
     ensure_dir(root)
     log.header("Bootstrap: Node project", str(root))
 
+    # git init, the package manager's init and the .gitignore write are independent: overlap them
+    git_init = None
     try:
         sh.ensure_bin("git")
         if not (root / ".git").exists():
             log.info("Initializing git repo …")
-            sh.run(["git", "init"], cwd=str(root))
+            git_init = sh.spawn(["git", "init"], cwd=str(root))
     except Exception as e:
         log.warn(f"Git init skipped: {e}")
 
+    def finish_git_init():
+        nonlocal git_init
+        try:
+            if git_init is not None:
+                sh.finish(git_init)
+        except Exception as e:
+            log.warn(f"Git init skipped: {e}")
+        git_init = None
+
+    pm_init = None
     try:
         if sh.which("npm"):
             log.info("Running npm init -y …")
-            sh.run(["npm", "init", "-y"], cwd=str(root))
+            pm_init = sh.spawn(["npm", "init", "-y"], cwd=str(root))
         elif sh.which("pnpm"):
             log.info("npm not found; using pnpm init …")
-            sh.run(["pnpm", "init"], cwd=str(root))
+            pm_init = sh.spawn(["pnpm", "init"], cwd=str(root))
         elif sh.which("yarn"):
+            # yarn may set up git and its own .gitignore, so it runs after git init and before ours
             log.info("npm not found; using yarn init -y …")
+            finish_git_init()
             sh.run(["yarn", "init", "-y"], cwd=str(root))
         else:
             log.warn("No Node package manager found (npm/pnpm/yarn). Skipping init.")
     except Exception as e:
+        finish_git_init()  # don't exit with git init still running in the background
         log.err(str(e))
         raise SystemExit(1)
 
     copy_gitignore(root)
-    log.ok("Wrote .gitignore")
+
+    finish_git_init()
+    try:
+        if pm_init is not None:
+            sh.finish(pm_init)
+    except Exception as e:
+        log.err(str(e))
+        raise SystemExit(1)
 
     try:
         sh.run(["git", "add", "."], cwd=str(root))
@@ -0,0 +1,15 @@
+import importlib
+import importlib.util
+from toolbelt.utils import lfu
+
+
+@lfu.memoize(128)
+def has(mod: str) -> bool:
+    """True if `mod` is importable in the current environment."""
+    return importlib.util.find_spec(mod) is not None
+
+
+def invalidate() -> None:
+    # Call after installing packages into this interpreter's environment
+    has.cache_clear()
+    importlib.invalidate_caches()
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterator, Sequence, Set, Tuple
+
+# Last successful tool runs, keyed by run_key(): {key: [tool, timestamp]}
+CACHE_FILE = Path.home() / ".cache" / "toolbelt" / "runs.json"
+MAX_ENTRIES = 256
+
+PY_EXTS = (".py", ".pyi", ".ipynb")
+
+# Directories each tool leaves out by default, and whether it also skips any dir holding a pyvenv.cfg.
+# A directory is only pruned from the fingerprint when every tool in the run skips it.
+TOOL_EXCLUDES = {
+    "ruff": (
+        set(
+            ".bzr .direnv .eggs .git .git-rewrite .hg .ipynb_checkpoints .mypy_cache .nox .pants.d .pyenv "
+            ".pytest_cache .pytype .ruff_cache .svn .tox .venv .vscode __pypackages__ _build buck-out build "
+            "dist node_modules site-packages venv".split()
+        ),
+        False,
+    ),
+    "black": (
+        set(
+            ".direnv .eggs .git .hg .ipynb_checkpoints .mypy_cache .nox .pytest_cache .ruff_cache .svn .tox "
+            ".venv .vscode __pypackages__ _build buck-out build dist venv".split()
+        ),
+        True,
+    ),
+    "isort": (
+        set(
+            ".bzr .direnv .eggs .git .hg .mypy_cache .nox .pants.d .svn .tox .venv __pypackages__ _build "
+            "buck-out build dist node_modules venv".split()
+        ),
+        False,
+    ),
+    "flake8": (set(".svn CVS .bzr .hg .git __pycache__ .tox .nox .eggs".split()), False),
+}
+
+# Files that change results without touching any source file: tool config, plus the ignore files
+# ruff/black honour and the .editorconfig isort reads
+CONFIG_FILES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "tox.ini",
+    "ruff.toml",
+    ".ruff.toml",
+    ".flake8",
+    ".isort.cfg",
+    ".editorconfig",
+    ".gitignore",
+    ".ignore",
+)
+
+
+def _excludes(tools: Sequence[str]) -> Tuple[Set[str], bool]:
+    # Unknown tools prune nothing, which can only cost a cache hit, never hide a change
+    rules = [TOOL_EXCLUDES.get(tool, (set(), False)) for tool in tools] or [(set(), False)]
+    skip_dirs = set.intersection(*(dirs for dirs, _ in rules))
+    skip_venvs = all(venvs for _, venvs in rules)
+    return skip_dirs, skip_venvs
+
+
+def _iter_files(path: str, exts: Tuple[str, ...], skip_dirs: Set[str], skip_venvs: bool) -> Iterator[str]:
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [
+            d
+            for d in dirs
+            if d not in skip_dirs and not (skip_venvs and os.path.exists(os.path.join(root, d, "pyvenv.cfg")))
+        ]
+        for name in files:
+            # Nested configs (pkg/pyproject.toml, pkg/ruff.toml, pkg/.gitignore) apply to their subtree
+            if name.endswith(exts) or name in CONFIG_FILES:
+                yield os.path.join(root, name)
+
+
+def _ancestor_configs(paths: Sequence[str]) -> Iterator[str]:
+    # The tools also pick up config from the targets' parent directories, up to the filesystem root
+    seen = set()
+    for path in [*paths, "."]:
+        directory = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path) or ".")
+        while directory not in seen:
+            seen.add(directory)
+            for name in CONFIG_FILES:
+                candidate = os.path.join(directory, name)
+                if os.path.isfile(candidate):
+                    yield candidate
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+
+def tree_fingerprint(paths: Sequence[str], tools: Sequence[str], exts: Tuple[str, ...] = PY_EXTS) -> bytes:
+    """Hash of (path, mtime, size) for every file `tools` would see under `paths` plus the configs that apply."""
+    skip_dirs, skip_venvs = _excludes(tools)
+    files = [
+        file
+        for path in paths
+        if os.path.exists(path)
+        for file in _iter_files(path, exts, skip_dirs, skip_venvs)
+    ]
+    entries = set()
+    for file in [*files, *_ancestor_configs(paths)]:
+        try:
+            st = os.stat(file)
+        except OSError:
+            continue
+        entries.add((os.path.abspath(file), st.st_mtime_ns, st.st_size))
+
+    h = hashlib.blake2b(digest_size=16)
+    for rel, mtime, size in sorted(entries):
+        h.update(f"{rel}\0{mtime}\0{size}\n".encode("utf-8", "surrogateescape"))
+    return h.digest()
+
+
+def _version(dist: str) -> str:
+    # Imported here: importlib.metadata is slow to import and most dev commands never get this far
+    from importlib import metadata
+
+    try:
+        return metadata.version(dist)
+    except metadata.PackageNotFoundError:
+        return "?"
+
+
+def run_key(tools: Sequence[str], args: Sequence[str], paths: Sequence[str]) -> str:
+    """Key for running `tools` with `args` over `paths` in the current directory, as things stand now."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(os.getcwd().encode("utf-8", "surrogateescape"))
+    for tool in tools:
+        h.update(f"\n{tool}=={_version(tool)}".encode("utf-8"))
+    h.update(json.dumps([list(args), list(paths)]).encode("utf-8"))
+    h.update(tree_fingerprint(paths, tools))
+    return h.hexdigest()
+
+
+def _load() -> dict:
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def seen(key: str) -> bool:
+    return key in _load()
+
+
+def remember(key: str, tool: str) -> None:
+    entries = _load()
+    entries[key] = [tool, time.time()]
+    if len(entries) > MAX_ENTRIES:
+        newest = sorted(entries.items(), key=lambda kv: kv[1][1], reverse=True)[:MAX_ENTRIES]
+        entries = dict(newest)
+
+    # Best effort: a cache we can't write just means the next run isn't skipped
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entries), encoding="utf-8")
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass
@@ -0,0 +1,67 @@
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
+
+
+class LFUCache:
+    """
+    Small least-frequently-used cache.
+
+    Unlike LRU, a key that has been hit many times (e.g. `git`) survives a burst of one-off
+    lookups. Eviction scans for the lowest count, which is fine at the sizes used here;
+    ties go to the oldest entry.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Any] = {}
+        self._hits: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._hits[key] += 1
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                victim = min(self._hits, key=self._hits.__getitem__)
+                del self._data[victim], self._hits[victim]
+            self._data[key] = value
+            self._hits.setdefault(key, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def memoize(maxsize: int = 128) -> Callable[[F], F]:
+    """Like functools.lru_cache, but with LFU eviction. Positional, hashable args only."""
+
+    def decorator(fn: F) -> F:
+        cache = LFUCache(maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            value = cache.get(args, _MISSING)
+            if value is _MISSING:
+                value = fn(*args)
+                cache.put(args, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -1,37 +1,55 @@
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import box
+# rich is imported lazily: most commands only print a few status lines, and
+# importing rich (plus building a Console) is a noticeable part of CLI startup.
+_console = None
 
-console = Console()
+
+def _c():
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def __getattr__(name: str):
+    # Keep `log.console` working for callers that print through it directly
+    if name == "console":
+        return _c()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def info(msg: str):
-    console.print(f"[bold cyan]ℹ[/] {msg}")
+    _c().print(f"[bold cyan]ℹ[/] {msg}")
 
 
 def ok(msg: str):
-    console.print(f"[bold green]✔[/] {msg}")
+    _c().print(f"[bold green]✔[/] {msg}")
 
 
 def warn(msg: str):
-    console.print(f"[bold yellow]⚠[/] {msg}")
+    _c().print(f"[bold yellow]⚠[/] {msg}")
 
 
 def err(msg: str):
-    console.print(f"[bold red]✖[/] {msg}")
+    _c().print(f"[bold red]✖[/] {msg}")
 
 
 def header(title: str, subtitle: str = ""):
-    console.print(
+    from rich import box
+    from rich.panel import Panel
+
+    _c().print(
         Panel.fit(title if not subtitle else f"{title}\n[dim]{subtitle}[/]", style="bold", box=box.ROUNDED)
     )
 
 
 def step(msg: str):
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     return Progress(
         SpinnerColumn(),
         TextColumn(f"[bold]{msg}[/]"),
         transient=True,
-        console=console,
+        console=_c(),
     )
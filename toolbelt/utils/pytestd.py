@@ -0,0 +1,153 @@
+import importlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+# Long-lived pytest worker: keeps the interpreter and pytest's import graph warm between runs.
+SOCKET_PATH = Path.home() / ".cache" / "toolbelt" / "pytestd.sock"
+IDLE_TIMEOUT = 30 * 60  # seconds without a request before the worker exits
+
+
+def supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        data = conn.recv(65536)
+        if not data:
+            return b"".join(chunks)
+        chunks.append(data)
+
+
+def _connect(timeout: Optional[float] = None) -> socket.socket:
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    try:
+        s.connect(str(SOCKET_PATH))
+    except OSError:
+        s.close()
+        raise
+    return s
+
+
+def is_alive() -> bool:
+    if not SOCKET_PATH.exists():
+        return False
+    try:
+        _connect(timeout=1).close()
+        return True
+    except OSError:
+        return False
+
+
+def spawn(wait: float = 10.0) -> None:
+    """Start the worker in its own session and wait until it accepts connections."""
+    subprocess.Popen(
+        [sys.executable, "-m", "toolbelt.utils.pytestd"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_alive():
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f"pytest daemon did not start (socket: {SOCKET_PATH})")
+
+
+def client_send(args: Sequence[str], cwd: str = ".") -> Tuple[int, str]:
+    """Run pytest with `args` inside the worker; returns (exit code, combined output)."""
+    with _connect() as s:
+        s.sendall(json.dumps({"args": list(args), "cwd": os.path.abspath(cwd)}).encode("utf-8"))
+        s.shutdown(socket.SHUT_WR)
+        reply = json.loads(_recv_all(s).decode("utf-8"))
+    return reply["code"], reply["out"]
+
+
+def _forget_project_modules(root: str) -> None:
+    # Drop anything imported from the project so edited sources/tests are re-imported next run,
+    # while pytest and third-party packages stay loaded.
+    root = os.path.join(os.path.realpath(root), "")
+    for name, mod in list(sys.modules.items()):
+        file = getattr(mod, "__file__", None)
+        if file and os.path.realpath(file).startswith(root) and "site-packages" not in file:
+            del sys.modules[name]
+    importlib.invalidate_caches()
+
+
+def _run_pytest(args: Sequence[str], cwd: str) -> Tuple[int, str]:
+    import pytest
+
+    saved_cwd, saved_path = os.getcwd(), list(sys.path)
+    saved_fds = os.dup(1), os.dup(2)
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as buf:
+        try:
+            os.chdir(cwd)
+            sys.path.insert(0, cwd)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # pytest captures at the fd level, so redirect fds rather than sys.stdout
+            os.dup2(buf.fileno(), 1)
+            os.dup2(buf.fileno(), 2)
+            try:
+                code = int(pytest.main(list(args)))
+            except Exception as e:  # keep the worker alive on internal errors
+                print(f"pytest daemon error: {e!r}", file=sys.stderr)
+                code = 3
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+            os.chdir(saved_cwd)
+            sys.path[:] = saved_path
+            _forget_project_modules(cwd)
+        buf.seek(0)
+        return code, buf.read()
+
+
+def serve() -> None:
+    import pytest  # noqa: F401  (warm the import graph before the first request)
+
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(SOCKET_PATH))
+    server.listen()
+    server.settimeout(IDLE_TIMEOUT)
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(None)
+                data = _recv_all(conn)
+                if not data:  # liveness probe from is_alive()
+                    continue
+                req = json.loads(data.decode("utf-8"))
+                code, out = _run_pytest(req.get("args", []), req.get("cwd", "."))
+                conn.sendall(json.dumps({"code": code, "out": out}).encode("utf-8"))
+    finally:
+        server.close()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,28 +1,153 @@
 import os
 import shutil
 import subprocess
-from typing import Sequence, Mapping, Optional, Tuple
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Deque, List, NoReturn, Sequence, Mapping, Optional, Tuple
+from toolbelt.utils import lfu
+
+# Lines of each stream kept for error context when output is streamed
+TAIL_LINES = 4096
 
 
 class ShellError(RuntimeError):
-    def __init__(self, cmd: Sequence[str], code: int, out: str, err: str):
+    def __init__(self, cmd: Sequence[str], code: int, out: str, err: str, streamed: bool = False):
         super().__init__(f"Command failed ({code}): {' '.join(cmd)}\n{err}")
         self.cmd, self.code, self.out, self.err = cmd, code, out, err
+        # True when out/err were already shown live and only hold the tail
+        self.streamed = streamed
+
+
+@lfu.memoize(128)
+def _which(bin_name: str, path: Optional[str]) -> Optional[str]:
+    return shutil.which(bin_name, path=path)
 
 
 def which(bin_name: str) -> Optional[str]:
-    return shutil.which(bin_name)
+    # Keyed on PATH too, so changing PATH never returns a stale hit
+    return _which(bin_name, os.environ.get("PATH"))
+
+
+def clear_cache() -> None:
+    _which.cache_clear()
+
+
+def _pump(src: IO[str], sink: IO[str], tail: Deque[str]) -> None:
+    for line in iter(src.readline, ""):
+        sink.write(line)
+        sink.flush()
+        tail.append(line.rstrip("\n"))
+    src.close()
 
 
 def run(
-    cmd: Sequence[str], cwd: Optional[str] = None, env: Optional[Mapping[str, str]] = None, check: bool = True
+    cmd: Sequence[str],
+    cwd: Optional[str] = None,
+    env: Optional[Mapping[str, str]] = None,
+    check: bool = True,
+    stream: bool = False,
 ) -> Tuple[str, str]:
-    p = subprocess.run(
-        cmd, cwd=cwd, env=None if env is None else {**os.environ, **env}, text=True, capture_output=True
+    """
+    Run `cmd` and return its (stdout, stderr).
+
+    With `stream=True` output is forwarded live to our stdout/stderr and only the last
+    TAIL_LINES lines of each stream are kept, so long runs don't buffer everything in memory.
+    """
+    full_env = None if env is None else {**os.environ, **env}
+    if not stream:
+        p = subprocess.run(cmd, cwd=cwd, env=full_env, text=True, capture_output=True)
+        if check and p.returncode != 0:
+            raise ShellError(cmd, p.returncode, p.stdout, p.stderr)
+        return p.stdout.strip(), p.stderr.strip()
+
+    out_tail: Deque[str] = deque(maxlen=TAIL_LINES)
+    err_tail: Deque[str] = deque(maxlen=TAIL_LINES)
+    # errors="replace": a decode error would kill a reader thread and leave the child blocked on a full pipe
+    p = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=full_env,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    pumps = [
+        threading.Thread(target=_pump, args=(p.stdout, sys.stdout, out_tail), daemon=True),
+        threading.Thread(target=_pump, args=(p.stderr, sys.stderr, err_tail), daemon=True),
+    ]
+    for t in pumps:
+        t.start()
+    p.wait()
+    for t in pumps:
+        t.join()
+
+    out, err = "\n".join(out_tail), "\n".join(err_tail)
+    if check and p.returncode != 0:
+        raise ShellError(cmd, p.returncode, out, err, streamed=True)
+    return out.strip(), err.strip()
+
+
+def run_parallel(
+    cmds: Sequence[Sequence[str]],
+    cwd: Optional[str] = None,
+    env: Optional[Mapping[str, str]] = None,
+    check: bool = True,
+) -> List[Tuple[str, str]]:
+    """Run independent commands concurrently; results come back in the order of `cmds`."""
+    if not cmds:
+        return []
+
+    full_env = None if env is None else {**os.environ, **env}
+
+    def _communicate(cmd: Sequence[str]) -> Tuple[int, str, str]:
+        p = subprocess.Popen(
+            cmd, cwd=cwd, env=full_env, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        out, err = p.communicate()
+        return p.returncode, out, err
+
+    with ThreadPoolExecutor(max_workers=len(cmds)) as pool:
+        results = list(pool.map(_communicate, cmds))
+
+    # Report the first failure in submission order so output stays deterministic
+    if check:
+        for cmd, (code, out, err) in zip(cmds, results):
+            if code != 0:
+                raise ShellError(cmd, code, out, err)
+    return [(out.strip(), err.strip()) for _, out, err in results]
+
+
+def spawn(
+    cmd: Sequence[str], cwd: Optional[str] = None, env: Optional[Mapping[str, str]] = None
+) -> subprocess.Popen:
+    """Start `cmd` in the background with captured output; collect it later with `finish()`."""
+    return subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=None if env is None else {**os.environ, **env},
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
     )
+
+
+def finish(p: subprocess.Popen, check: bool = True) -> Tuple[str, str]:
+    """Wait for a `spawn()`ed process; same result/error contract as `run()`."""
+    out, err = p.communicate()
     if check and p.returncode != 0:
-        raise ShellError(cmd, p.returncode, p.stdout, p.stderr)
-    return p.stdout.strip(), p.stderr.strip()
+        raise ShellError(p.args, p.returncode, out, err)
+    return out.strip(), err.strip()
+
+
+def replace_process(cmd: Sequence[str]) -> NoReturn:
+    """exec `cmd` in place of this process; its exit code becomes ours."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(cmd[0], list(cmd))
 
 
 def ensure_bin(name: str):